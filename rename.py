@@ -2,8 +2,19 @@
 
 import os
 import re
+import mmap
+import shutil
 import fnmatch
+import tempfile
 import mimetypes
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional: file contents are scanned with the alternation regex instead
+    ahocorasick = None
 
 """
 File Renamer and Replacer
@@ -25,9 +36,48 @@ Example:
 
 The script also supports excluding specific directories and file extensions during the search and replace process.
 
+Matching is always case-sensitive. Case preservation is handled upstream: every case variation of the needle is
+generated once and matched literally, so no case-insensitive regex or lowercased comparison is needed.
+
 Please ensure that you have backups of your files before running this script as it makes changes that cannot be undone.
 """
 
+# Case type patterns used by detect_case_type to validate the candidate case types.
+# camelCase requires an uppercase letter so that lowercase words are detected as snake_case
+_CASE_PATTERNS = {
+    'camelCase': re.compile(r'^[a-z][a-z0-9]*[A-Z][a-zA-Z0-9]*$'),  # Lowercase first character, followed by a mix of alphanumeric characters with at least one uppercase
+    'PascalCase': re.compile(r'^[A-Z][a-zA-Z0-9]*$'),               # Uppercase first character, followed by a mix of alphanumeric characters
+    'snake_case': re.compile(r'^[a-z0-9]+(?:_[a-z0-9]+)*$'),        # Lowercase or numbers, separated by underscores
+    'kebab-case': re.compile(r'^[a-z0-9]+(?:-[a-z0-9]+)*$'),        # Lowercase or numbers, separated by hyphens
+}
+
+# Word separators and boundaries: a run of hyphens, underscores or spaces, an uppercase letter
+# following any other character, or the last letter of an uppercase run followed by a lowercase letter
+_WORD_BOUNDARY = re.compile(r'[-_ ]+|(?<=[^A-Z\-_ ])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+# Translation tables swapping the kebab-case and snake_case delimiters
+_KEBAB_TO_SNAKE = str.maketrans('-', '_')
+_SNAKE_TO_KEBAB = str.maketrans('_', '-')
+
+# Case type kept when several case variations of a needle are identical, the original text first
+_CASE_PRIORITY = ('original', 'kebab-case', 'snake_case', 'camelCase', 'PascalCase')
+
+# Files larger than this are streamed through mmap instead of being read in memory
+_LARGE_FILE_SIZE = 1 << 20
+
+# Size of the chunks read when a large file cannot be memory-mapped
+_STREAM_CHUNK_SIZE = 1 << 16
+
+# Number of bytes read to guess if a file with an unknown extension is a text file
+_SNIFF_SIZE = 8192
+
+# Version control metadata directories, never walked
+_VCS_DIRS = frozenset({'.git', '.hg', '.svn'})
+
+# Number of threads used to replace text inside files, worker processes default to one per CPU
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+@lru_cache(maxsize=2048)
 def to_pascal_case(kebab_str: str) -> str:
     """
     Convert a kebab-case string to PascalCase.
@@ -40,6 +90,7 @@ def to_pascal_case(kebab_str: str) -> str:
     """
     return ''.join(word.capitalize() for word in kebab_str.split('-'))
 
+@lru_cache(maxsize=2048)
 def to_camel_case(kebab_str: str) -> str:
     """
     Convert a kebab-case string to camelCase.
@@ -54,83 +105,88 @@ def to_camel_case(kebab_str: str) -> str:
     return parts[0].lower() + ''.join(word.capitalize() for word in parts[1:])
 
 
+@lru_cache(maxsize=2048)
 def to_snake_case(s: str) -> str:
     """
-    Convert a kebab-case string to snake_case.
-
-    This function assumes that the input string is in kebab-case.
+    Convert a string from camelCase, PascalCase, snake_case, or kebab-case to snake_case.
 
     Parameters:
-    s (str): The kebab-case string to convert to snake_case.
+    s (str): The string to convert to snake_case, usually in kebab-case.
 
     Returns:
     str: The string converted to snake_case format.
     """
-    # Replace hyphens with underscores to convert to snake_case
-    return s.replace('-', '_')
+    # Fast path for lowercase kebab-case input: swap the delimiters in a single translate pass
+    if '_' not in s and ' ' not in s and '--' not in s and s.islower():
+        return s.translate(_KEBAB_TO_SNAKE)
+
+    return _WORD_BOUNDARY.sub('_', s).lower()
 
 
+@lru_cache(maxsize=2048)
 def to_kebab_case(s: str) -> str:
     """
     Convert a string from camelCase, PascalCase, snake_case, or kebab-case to kebab-case.
-    Throw an error if the conversion results in consecutive hyphens.
+
+    Runs of uppercase letters are kept together as one word, e.g. 'XMLHttpRequest' becomes 'xml-http-request'.
 
     Parameters:
     s (str): The string to convert to kebab-case.
 
     Returns:
     str: The string converted to kebab-case format.
-
-    Raises:
-    ValueError: If the conversion results in consecutive hyphens.
     """
-    # Replace underscores and spaces with hyphens
-    s = s.replace('_', '-').replace(' ', '-')
-
-    # Insert hyphens before uppercase letters not at the start of the string and convert to lowercase
-    kebab_case_string = re.sub(r'(?<!^)(?=[A-Z])', '-', s).lower()
+    # Fast path for lowercase snake_case input: swap the delimiters in a single translate pass
+    if '-' not in s and ' ' not in s and '__' not in s and s.islower():
+        return s.translate(_SNAKE_TO_KEBAB)
 
-    # Remove potential consecutive hyphens caused by the above transformations
-    kebab_case_string = re.sub(r'-+', '-', kebab_case_string)
+    # Replace separators and word boundaries with a single hyphen in one regex pass, then convert to lowercase
+    return _WORD_BOUNDARY.sub('-', s).lower()
 
-    return kebab_case_string
-
-def detect_case_type(string: str) -> str:
+@lru_cache(maxsize=4096)
+def detect_case_type(string: str, strict: bool = True) -> str:
     """
     Detect the case type of a given string.
 
+    The candidate case type is picked with cheap character tests: a hyphen means kebab-case, an underscore
+    snake_case, an uppercase first character PascalCase, and camelCase or snake_case otherwise.
+
     Parameters:
     string (str): The string for which to detect the case type.
+    strict (bool): If True, validate the candidate with its regex and return 'other' if it does not match.
+                   If False, return the candidate without validation.
 
     Returns:
     str: A string indicating the detected case type.
          Possible returns are 'camelCase', 'PascalCase', 'snake_case', 'kebab-case', or 'other'.
     """
-    patterns = {
-        # 'snake_case': r'^[a-z]+(_[a-z]+)*$',
-        # 'kebab-case': r'^[a-z]+(-[a-z]+)*$',
-        # 'camelCase': r'^[a-z][a-zA-Z0-9]*$',
-        # 'PascalCase': r'^[A-Z][a-zA-Z0-9]*$'
-        
-        # 'snake_case': r'^[a-z0-9]+(?:_[a-z0-9]+)*$',  # Allow numbers within snake_case
-        # 'kebab-case': r'^[a-z]+(?:-[a-z0-9]+)*$',    # Allow numbers within kebab-case
-        # 'camelCase': r'^[a-z][a-zA-Z0-9]*$',         # Lowercase first character, no underscores or hyphens
-        # 'PascalCase': r'^[A-Z][a-zA-Z0-9]*$',        # Uppercase first character, no underscores or hyphens
-        
-        'snake_case': r'^[a-z0-9]+(?:_[a-z0-9]+)*$',   # Lowercase or numbers, separated by underscores
-        'kebab-case': r'^[a-z0-9]+(?:-[a-z0-9]+)*$',   # Lowercase or numbers, separated by hyphens
-        'camelCase': r'^[a-z][a-zA-Z0-9]*$',           # Lowercase first character, followed by a mix of alphanumeric characters
-        'PascalCase': r'^[A-Z][a-zA-Z0-9]*$',          # Uppercase first character, followed by a mix of alphanumeric characters
+    if '-' in string:
+        candidates = ('kebab-case',)
+    elif '_' in string:
+        candidates = ('snake_case',)
+    elif string[:1].isupper():
+        candidates = ('PascalCase',)
+    else:
+        candidates = ('camelCase', 'snake_case')
 
-    }
+    if not strict:
+        return candidates[0]
 
-    for case, pattern in patterns.items():
-        if re.match(pattern, string):
+    for case in candidates:
+        if _CASE_PATTERNS[case].match(string):
             return case
-    
+
     return 'other'
 
 
+# Converter from kebab-case to each supported target case
+_CONVERTERS = {
+    'camelCase': to_camel_case,
+    'PascalCase': to_pascal_case,
+    'snake_case': to_snake_case,
+    'kebab-case': to_kebab_case,
+}
+
 def convert_string(string: str, to_case: str) -> str:
     """
     Convert a string from its detected naming convention to another specified convention.
@@ -142,33 +198,26 @@ def convert_string(string: str, to_case: str) -> str:
     Returns:
     str: The string converted to the target naming convention.
     """
-    
-    kebab = to_kebab_case(string)
-
-    # Convert the string to the target case from the detected case
-    if to_case == 'camelCase':
-        return to_camel_case(kebab)
-    elif to_case == 'PascalCase':
-        return to_pascal_case(kebab)
-    elif to_case == 'snake_case':
-        return to_snake_case(kebab)
-    elif to_case == 'kebab-case':
-        return kebab
-    elif to_case == 'other':
-        return string
-    else:
+    converter = _CONVERTERS.get(to_case)
+    if converter is None:
+        if to_case == 'other':
+            return string
         raise ValueError(f"Unsupported target case: {to_case}")
+
+    # Convert the string to the target case going through kebab-case
+    return converter(to_kebab_case(string))
     
     
-def generate_all_case_variations(text: str) -> dict:
+@lru_cache(maxsize=2048)
+def _case_variations(text: str) -> tuple:
     """
-    Generate all case variations for a given text.
+    Generate all case variations for a given text, cached as an immutable tuple.
 
     Parameters:
     text (str): The text to generate case variations for.
 
     Returns:
-    dict: A dictionary with keys as case types and values as the text in that case format.
+    tuple: (case type, text in that case format) pairs.
     """
 
     # Error if string is not valid
@@ -176,15 +225,177 @@ def generate_all_case_variations(text: str) -> dict:
     
     kebab = to_kebab_case(text)
   
-    return {
-        'original': text,
-        'camelCase': to_camel_case(kebab),
-        'PascalCase': to_pascal_case(kebab),
-        'snake_case':  to_snake_case(kebab),
-        'kebab-case': kebab
-    }
+    return (
+        ('original', text),
+        ('camelCase', to_camel_case(kebab)),
+        ('PascalCase', to_pascal_case(kebab)),
+        ('snake_case', to_snake_case(kebab)),
+        ('kebab-case', kebab),
+    )
+
+def generate_all_case_variations(text: str) -> dict:
+    """
+    Generate all case variations for a given text.
+
+    Parameters:
+    text (str): The text to generate case variations for.
+
+    Returns:
+    dict: A dictionary with keys as case types and values as the text in that case format.
+    """
+    return dict(_case_variations(text))
     
 
+def clear_caches():
+    """
+    Clear the caches of the case conversion, case variation and replacement pattern functions.
+    """
+    for cached in (to_pascal_case, to_camel_case, to_snake_case, to_kebab_case, detect_case_type, _case_variations, _compile_replacement_pattern):
+        cached.cache_clear()
+
+def build_replacement_pairs(needle_variations: dict, replacement_variations: dict) -> list:
+    """
+    Build the (needle, replacement) pairs used to replace text, longest needle first.
+
+    Case types producing the same needle are deduplicated, keeping the replacement of the first
+    case type in _CASE_PRIORITY order.
+
+    Parameters:
+    needle_variations (dict): All case variations of the needle text.
+    replacement_variations (dict): All case variations of the replacement text.
+
+    Returns:
+    list: A list of unique (needle_variation, replacement_variation) tuples sorted by descending needle length.
+    """
+    priority = {case_type: i for i, case_type in enumerate(_CASE_PRIORITY)}
+    unique = {}
+    for case_type in sorted(needle_variations, key=lambda case_type: priority.get(case_type, len(priority))):
+        needle_variation = needle_variations[case_type]
+        if needle_variation and needle_variation not in unique:
+            unique[needle_variation] = replacement_variations[case_type]
+    return sorted(unique.items(), key=lambda pair: -len(pair[0]))
+
+def build_replacement_pattern(needle_variations: dict, replacement_variations: dict) -> tuple:
+    """
+    Compile all needle variations into a single alternation regex.
+
+    Longer needles are tried first so that a variation never matches inside a longer one.
+
+    Parameters:
+    needle_variations (dict): All case variations of the needle text.
+    replacement_variations (dict): All case variations of the replacement text.
+
+    Returns:
+    tuple: The compiled pattern and a dict mapping each needle variation to its replacement.
+    """
+    pattern, mapping = _compile_replacement_pattern(tuple(build_replacement_pairs(needle_variations, replacement_variations)))
+    return pattern, dict(mapping)
+
+@lru_cache(maxsize=256)
+def _compile_replacement_pattern(pairs: tuple) -> tuple:
+    """
+    Compile (needle, replacement) pairs into a single alternation regex, cached by pairs.
+
+    The returned mapping is shared between callers and must not be modified.
+
+    Parameters:
+    pairs (tuple): The (needle, replacement) pairs from build_replacement_pairs.
+
+    Returns:
+    tuple: The compiled pattern and a dict mapping each needle variation to its replacement.
+    """
+    mapping = dict(pairs)
+    pattern = re.compile('|'.join(re.escape(needle_variation) for needle_variation in mapping))
+    return pattern, mapping
+
+def _replace_with_pattern(text, pattern: re.Pattern, mapping: dict) -> tuple:
+    """
+    Replace every needle variation in a text in a single pass.
+
+    The text, pattern and mapping must either all be str or all be bytes.
+
+    Parameters:
+    text (str | bytes): The text to replace the needle variations in.
+    pattern (re.Pattern): The alternation pattern from build_replacement_pattern.
+    mapping (dict): The needle to replacement mapping from build_replacement_pattern.
+
+    Returns:
+    tuple: The new text and a dict counting the replacements made per needle variation.
+    """
+    matched = {}
+
+    def replace(match):
+        needle_variation = match.group(0)
+        matched[needle_variation] = matched.get(needle_variation, 0) + 1
+        return mapping[needle_variation]
+
+    return pattern.sub(replace, text), matched
+
+def _build_automaton(mapping: dict):
+    """
+    Build an Aho-Corasick automaton of the bytes needle variations, if pyahocorasick is installed.
+
+    The automaton works on str keys, so the needles are decoded as latin-1 which maps each byte
+    to exactly one character and keeps the match indexes equal to byte offsets.
+
+    Parameters:
+    mapping (dict): The bytes needle to bytes replacement mapping.
+
+    Returns:
+    ahocorasick.Automaton: The automaton with each needle as value, or None if pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for needle_variation in mapping:
+        automaton.add_word(needle_variation.decode('latin-1'), needle_variation)
+    automaton.make_automaton()
+    return automaton
+
+def _replace_with_automaton(content: bytes, automaton, mapping: dict) -> tuple:
+    """
+    Replace every needle variation in a bytes content in a single Aho-Corasick pass.
+
+    Matches are resolved as with the alternation pattern: the leftmost match wins, the longest needle
+    among matches starting at the same position, and matches overlapping a kept one are dropped.
+
+    Parameters:
+    content (bytes): The content to replace the needle variations in.
+    automaton (ahocorasick.Automaton): The automaton from _build_automaton.
+    mapping (dict): The bytes needle to bytes replacement mapping.
+
+    Returns:
+    tuple: The new content (bytes or bytearray) and a dict counting the replacements made per needle variation.
+    """
+    # iter() reports every match, overlapping ones included, so keep the longest needle per start position
+    longest = {}
+    for end, needle_variation in automaton.iter(content.decode('latin-1')):
+        start = end + 1 - len(needle_variation)
+        if len(needle_variation) > len(longest.get(start, b'')):
+            longest[start] = needle_variation
+
+    matched = {}
+    if not longest:
+        return content, matched
+
+    # Append slices of a memoryview into one growing buffer, so the content is copied only once
+    view = memoryview(content)
+    new_content = bytearray()
+    last = 0
+    for start in sorted(longest):
+        # Skip matches overlapping the previous kept one
+        if start < last:
+            continue
+        needle_variation = longest[start]
+        new_content += view[last:start]
+        new_content += mapping[needle_variation]
+        last = start + len(needle_variation)
+        matched[needle_variation] = matched.get(needle_variation, 0) + 1
+
+    new_content += view[last:]
+    return new_content, matched
+
 def replace_text_in_filename(filename: str, needle_variations: dict, replacement_variations: dict) -> str:
     """
     Replace text in a filename with the appropriate case format.
@@ -197,41 +408,361 @@ def replace_text_in_filename(filename: str, needle_variations: dict, replacement
     Returns:
     str: The new filename with the replacement text.
     """
-    for case_type, needle_variation in needle_variations.items():
-        if needle_variation in filename:
-            return filename.replace(needle_variation, replacement_variations[case_type])
-    return filename
+    # Most filenames contain no variation at all, skip building the pairs for them
+    if not any(variation and variation in filename for variation in needle_variations.values()):
+        return filename
 
-def rename_files(directory: str, needle: str, replacement: str, exclude_dirs=None, dry_run: bool = False, ask: bool = True):
+    # The alternation pattern is compiled once per needle and replacement, not once per filename
+    pattern, mapping = _compile_replacement_pattern(tuple(build_replacement_pairs(needle_variations, replacement_variations)))
+    return _replace_with_pattern(filename, pattern, mapping)[0]
+
+def _ensure_nonempty(directory: str):
     """
-    Rename files within the given directory and its subdirectories.
-    It looks for the needle in any naming convention in the filenames and replaces it with the
-    replacement in the same naming convention.
+    Check that a directory exists and is not empty, reading at most one entry.
 
     Parameters:
-    directory (str): The root directory from which to start renaming files.
-    needle (str): The substring to look for in filenames for renaming.
-    replacement (str): The substring that will replace the needle in filenames.
-    exclude_dirs (list): Directories to exclude from the search.
-    dry_run (bool): If True, print out the rename actions without performing them.
-    ask (bool): If True, ask for confirmation before performing the replace operation.
+    directory (str): The directory to check.
+
+    Raises:
+    ValueError: If the directory is empty or does not exist.
     """
-    # Verify the directory exists and is not empty
-    if not os.listdir(directory):
+    try:
+        with os.scandir(directory) as it:
+            first = next(it, None)
+    except (FileNotFoundError, NotADirectoryError):
+        first = None
+
+    if first is None:
         raise ValueError(f"The directory '{directory}' is empty or does not exist.")
 
+def _iter_files(directory: str, exclude_dirs):
+    """
+    Yield the files of a directory and its subdirectories as os.DirEntry objects.
+
+    Each directory is fully listed before any of its entries is yielded, so renaming the yielded
+    files does not affect the listing. Symlinked directories are not followed. Other entries, including
+    dangling symlinks and special files, are yielded so that they can be renamed.
+
+    Parameters:
+    directory (str): The directory to walk.
+    exclude_dirs (frozenset): Directory names whose subtree is skipped.
+
+    Yields:
+    os.DirEntry: The entry of each file found.
+    """
+    # Walk with an explicit stack of directories rather than recursion, in the same top-down order
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            # The entry type comes from the directory listing, only symlinks need a stat to be resolved
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in exclude_dirs:
+                    subdirs.append(entry.path)
+            elif not (entry.is_symlink() and entry.is_dir()):
+                yield entry
+
+        stack.extend(reversed(subdirs))
+
+def _compile_exclude_patterns(patterns) -> re.Pattern:
+    """
+    Compile fnmatch-style exclude patterns into a single regex.
+
+    Parameters:
+    patterns (list): The wildcard patterns to exclude, e.g. '*.min.js'.
+
+    Returns:
+    re.Pattern: A pattern matching the filenames matched by any of the patterns, or None if there is no pattern.
+    """
+    # Drop duplicates while keeping the order, and ignore empty patterns
+    patterns = [pat for pat in dict.fromkeys(patterns or ()) if pat]
+    if not patterns:
+        return None
+    return re.compile('|'.join('(?:' + fnmatch.translate(os.path.normcase(pat)) + ')' for pat in patterns))
+
+def _validate_arguments(directory: str, needle: str):
+    """
+    Validate the directory and needle shared by rename_files and replace_in_files.
+
+    Parameters:
+    directory (str): The root directory of the operation.
+    needle (str): The substring to look for.
+
+    Raises:
+    ValueError: If the directory is empty or does not exist, or if the needle is empty.
+    """
+    # Verify the directory exists and is not empty
+    _ensure_nonempty(directory)
+
     # Verify the needle is not falsy
     if not needle:
         raise ValueError("The needle must not be empty or only whitespace.")
 
-    # Check if the replacement is falsy and ask for confirmation
-    if not replacement and ask:
-        confirmation = input("The replacement string is empty. This will remove the needle from filenames. Are you sure you want to continue? (y/n): ")
-        if confirmation.lower() != 'y':
-            print("Operation cancelled.")
+def _ask_confirmation(question: str) -> bool:
+    """
+    Ask the user a yes/no question, printing a cancellation message on any answer but 'y'.
+
+    Parameters:
+    question (str): The question to ask.
+
+    Returns:
+    bool: True if the user confirmed, False otherwise.
+    """
+    confirmation = input(f"{question} (y/n): ")
+    if confirmation.lower() != 'y':
+        print("Operation cancelled.")
+        return False
+    return True
+
+def _apply_renames(plan: list, dry_run: bool):
+    """
+    Apply the renames planned by rename_and_replace.
+
+    Parameters:
+    plan (list): (original path, new path) tuples.
+    dry_run (bool): If True, print out the rename actions without performing them.
+    """
+    if dry_run:
+        for original_file_path, new_file_path in plan:
+            print(f'Would rename "{original_file_path}" to "{new_file_path}"')
+        return
+
+    rename = os.replace
+    for original_file_path, new_file_path in plan:
+        try:
+            # os.replace overwrites silently, so refuse an existing destination unless it is the same file,
+            # as in a case-only rename on a case-insensitive filesystem
+            if os.path.lexists(new_file_path) and not os.path.samefile(original_file_path, new_file_path):
+                print(f'Error renaming file {original_file_path}: "{new_file_path}" already exists')
+                continue
+            rename(original_file_path, new_file_path)
+            print(f'Renamed "{original_file_path}" to "{new_file_path}"')
+        except OSError as e:
+            print(f"Error renaming file {original_file_path}: {e}")
+
+def _replace_in_mapped(source: mmap.mmap, pattern: re.Pattern, mapping: dict, matched: dict):
+    """
+    Yield the pieces of a memory-mapped file with every needle variation replaced.
+
+    Parameters:
+    source (mmap.mmap): The mapped file content.
+    pattern (re.Pattern): The bytes alternation pattern of the needle variations.
+    mapping (dict): The bytes needle to bytes replacement mapping.
+    matched (dict): Updated with the number of replacements made per needle variation.
+
+    Yields:
+    bytes: The successive pieces of the new content.
+    """
+    last = 0
+    for match in pattern.finditer(source):
+        needle_variation = match.group(0)
+        yield source[last:match.start()]
+        yield mapping[needle_variation]
+        last = match.end()
+        matched[needle_variation] = matched.get(needle_variation, 0) + 1
+    yield source[last:]
+
+def _replace_in_chunks(file, pattern: re.Pattern, mapping: dict, matched: dict):
+    """
+    Yield the pieces of a file read by chunks with every needle variation replaced.
+
+    Consecutive chunks overlap by the length of the longest needle minus one, and a match is only
+    replaced once every needle that could start at its position fits in the buffer, so matches
+    spanning two chunks are replaced exactly as in a single pass over the whole file.
+
+    Parameters:
+    file (BinaryIO): The file to read, opened in binary mode.
+    pattern (re.Pattern): The bytes alternation pattern of the needle variations.
+    mapping (dict): The bytes needle to bytes replacement mapping.
+    matched (dict): Updated with the number of replacements made per needle variation.
+
+    Yields:
+    bytes: The successive pieces of the new content.
+    """
+    overlap = max(map(len, mapping)) - 1
+    buffer = b''
+    while True:
+        chunk = file.read(_STREAM_CHUNK_SIZE)
+        buffer += chunk
+
+        # Matches starting from the limit may continue in the next chunk, except at the end of the file
+        limit = len(buffer) - overlap if chunk else len(buffer)
+        last = 0
+        for match in pattern.finditer(buffer):
+            if match.start() >= limit:
+                break
+            needle_variation = match.group(0)
+            yield buffer[last:match.start()]
+            yield mapping[needle_variation]
+            last = match.end()
+            matched[needle_variation] = matched.get(needle_variation, 0) + 1
+        if last < limit:
+            yield buffer[last:limit]
+            last = limit
+        buffer = buffer[last:]
+
+        if not chunk:
             return
+
+def _replace_in_large_file(file_path: str, pattern: re.Pattern, mapping: dict, dry_run: bool) -> dict:
+    """
+    Replace every needle variation in a large file without loading it in memory.
+
+    The file is mapped read-only, or read by chunks if it cannot be mapped, and the result is
+    streamed to a temporary file in the same directory, which then atomically replaces the original.
+
+    Parameters:
+    file_path (str): The path of the file to replace the needle variations in.
+    pattern (re.Pattern): The bytes alternation pattern of the needle variations.
+    mapping (dict): The bytes needle to bytes replacement mapping.
+    dry_run (bool): If True, only count the matches without writing anything.
+
+    Returns:
+    dict: The number of replacements made per needle variation.
+    """
+    # Write through symlinks, the link itself must not be replaced by a regular file
+    file_path = os.path.realpath(file_path)
+
+    matched = {}
+    with open(file_path, 'rb') as file:
+        try:
+            source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Some files cannot be mapped, e.g. on a few network filesystems
+            source = None
+
+        try:
+            if source is not None:
+                if pattern.search(source) is None:
+                    return matched
+                pieces = _replace_in_mapped(source, pattern, mapping, matched)
+            else:
+                pieces = _replace_in_chunks(file, pattern, mapping, matched)
+
+            if dry_run:
+                for _ in pieces:
+                    pass
+                return matched
+
+            tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(file_path), delete=False)
+            try:
+                with tmp:
+                    for piece in pieces:
+                        tmp.write(piece)
+                shutil.copymode(file_path, tmp.name)
+            except BaseException:
+                os.remove(tmp.name)
+                raise
+        finally:
+            if source is not None:
+                source.close()
+
+    if not matched:
+        os.remove(tmp.name)
+        return matched
+
+    os.replace(tmp.name, file_path)
+    return matched
+
+def _replace_in_file(file_path: str, pattern: re.Pattern, mapping: dict, automaton, dry_run: bool) -> dict:
+    """
+    Replace every needle variation inside a file.
+
+    This is a module-level function so that it can run in a thread as well as in a worker process.
+
+    Parameters:
+    file_path (str): The path of the file to replace the needle variations in.
+    pattern (re.Pattern): The bytes alternation pattern of the needle variations.
+    mapping (dict): The bytes needle to bytes replacement mapping.
+    automaton (ahocorasick.Automaton): The automaton from _build_automaton, or None to use the pattern.
+    dry_run (bool): If True, only count the matches without writing anything.
+
+    Returns:
+    dict: The number of replacements made per needle variation.
+    """
+    if os.path.getsize(file_path) > _LARGE_FILE_SIZE:
+        # Stream large files instead of reading them in memory
+        return _replace_in_large_file(file_path, pattern, mapping, dry_run)
+
+    # Read and potentially replace content as bytes, skipping the decode and encode round trip
+    with open(file_path, 'rb') as file:
+        content = file.read()
+
+    # Most files do not contain the needle, a plain substring search rejects them faster than the regex
+    if not any(needle_variation in content for needle_variation in mapping):
+        return {}
+
+    # Replace the needle in any format in a single pass
+    if automaton is not None:
+        new_content, matched = _replace_with_automaton(content, automaton, mapping)
+    else:
+        new_content, matched = _replace_with_pattern(content, pattern, mapping)
+
+    # If changes were made, write them back to the file
+    if matched and not dry_run:
+        with open(file_path, 'wb') as file:
+            file.write(new_content)
+    return matched
+
+# Arguments of _replace_in_file following the file path, set once in each worker process
+_worker_replace_args = None
+
+def _init_replace_worker(replace_args: tuple):
+    """
+    Store the replace arguments in a worker process, so that they are pickled once per process.
+
+    Parameters:
+    replace_args (tuple): The arguments of _replace_in_file following the file path.
+    """
+    global _worker_replace_args
+    _worker_replace_args = replace_args
+
+def _replace_in_worker(file_path: str) -> dict:
+    """
+    Replace every needle variation inside a file, in a worker process set up by _init_replace_worker.
+
+    Parameters:
+    file_path (str): The path of the file to replace the needle variations in.
+
+    Returns:
+    dict: The number of replacements made per needle variation.
+    """
+    return _replace_in_file(file_path, *_worker_replace_args)
+
+def rename_and_replace(directory: str, needle: str, replacement: str, exclude_dirs=None, exclude_extensions=None, dry_run: bool = False, ask: bool = True, rename: bool = True, replace: bool = True, max_workers: int = None, processes: bool = False):
+    """
+    Rename files and replace text inside files in a single walk of the given directory and its subdirectories.
+    It looks for the needle in any naming convention (camelCase, PascalCase, snake_case, kebab-case) and replaces it
+    with the replacement in the same naming convention.
+
+    Parameters:
+    directory (str): The root directory from which to start.
+    needle (str): The substring to look for in filenames and file contents.
+    replacement (str): The substring that will replace the needle.
+    exclude_dirs (list): Directories to exclude from the search, in addition to .git, .hg and .svn which are always excluded.
+    exclude_extensions (list): File extensions to exclude from the replace inside files.
+    dry_run (bool): If True, print out the actions without performing them.
+    ask (bool): If True, ask for confirmation before performing the operation.
+    rename (bool): If True, rename the files whose name contains the needle.
+    replace (bool): If True, replace the needle inside text files.
+    max_workers (int): The number of threads or processes replacing inside files, defaults to min(32, 4 * CPU count)
+                       threads, or to one process per CPU.
+    processes (bool): If True, replace inside files in worker processes instead of threads, for CPU-bound workloads.
+    """
+    _validate_arguments(directory, needle)
+
+    # Check if the replacement is falsy and ask for confirmation
+    if not replacement and ask and not _ask_confirmation("The replacement string is empty. This will remove the needle from filenames. Are you sure you want to continue?"):
+        return
           
     exclude_dirs = exclude_dirs if exclude_dirs else []
+    exclude_extensions = exclude_extensions if exclude_extensions else []
           
     # Print the operation details
     abs_directory = os.path.abspath(directory)
@@ -239,45 +770,129 @@ def rename_files(directory: str, needle: str, replacement: str, exclude_dirs=Non
     print(f"Needle: {needle}")
     print(f"Replacement: {replacement}")
     print(f"Exclude directory: {exclude_dirs}")
+    if replace:
+        print(f"Exclude extensions: {exclude_extensions}")
     print(f"Dry Run: {dry_run}")
     
     # Ask for user confirmation
     if ask:
         if dry_run:
-            confirmation = input("The operation is in dry run mode. Do you want to proceed? (y/n): ")
+            question = "The operation is in dry run mode. Do you want to proceed?"
         else:
-            confirmation = input("Are you sure you want to rename files? This action cannot be undone. (y/n): ")
-
-        if confirmation.lower() != 'y':
-            print("Operation cancelled.")
+            actions = ' and '.join(action for action, enabled in (('rename files', rename), ('replace inside files', replace)) if enabled)
+            question = f"Are you sure you want to {actions}? This action cannot be undone."
+        if not _ask_confirmation(question):
             return
 
     # Generate all case variations for needle and replacement
     needle_variations = generate_all_case_variations(needle)
     replacement_variations = generate_all_case_variations(replacement)
+    pattern, mapping = build_replacement_pattern(needle_variations, replacement_variations)
+
+    if replace:
+        # File contents are matched as bytes: UTF-8 is self-synchronizing, so the matches are the same as on text
+        bytes_pattern = re.compile(pattern.pattern.encode('utf-8'))
+        bytes_mapping = {variation.encode('utf-8'): value.encode('utf-8') for variation, value in mapping.items()}
+        automaton = _build_automaton(bytes_mapping)
+        exclude_re = _compile_exclude_patterns(exclude_extensions)
+        # Arguments of _replace_in_file following the file path
+        replace_args = (bytes_pattern, bytes_mapping, automaton, dry_run)
+    else:
+        replace_args = None
+
+    # Names like __init__.py or index.js repeat across directories, the cache dies with this call
+    @lru_cache(maxsize=4096)
+    def new_name(filename: str) -> str:
+        return _replace_with_pattern(filename, pattern, mapping)[0]
+
+    plan = []
+    # Bind the per-file lookups to locals once for the loop
+    append = plan.append
+    join = os.path.join
+    dirname = os.path.dirname
+
+    # Files are independent, so replace inside them concurrently: threads overlap the I/O,
+    # processes also spread the regex work, which holds the GIL, over the CPU cores
+    if processes:
+        # CPU-bound workers default to one per core, and receive the replace arguments once
+        # when they start instead of pickling them again with every file
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_replace_worker, initargs=(replace_args,))
+        replace_file, submit_args = _replace_in_worker, ()
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers or _MAX_WORKERS)
+        replace_file, submit_args = _replace_in_file, replace_args
+
+    with executor:
+        futures = {}
+        # Version control metadata is always skipped, sniffing would otherwise treat it as text
+        for entry in _iter_files(directory, _VCS_DIRS.union(exclude_dirs)):
+            filename = entry.name
+
+            # Plan the rename, applied once the walk and the replace inside files are done
+            if rename:
+                new_filename = new_name(filename)
+                if new_filename != filename:
+                    path = entry.path
+                    append((path, join(dirname(path), new_filename)))
+
+            if not replace:
+                continue
+
+            # Only regular files have content to replace, opening a FIFO or a device could block
+            if not entry.is_file():
+                continue
+
+            # Skip excluded extensions
+            if exclude_re is not None and exclude_re.match(os.path.normcase(filename)):
+                continue
+
+            # Skip binary files, sniffing the content only when the extension is unknown
+            if not is_text_file_by_ext(filename) and not _looks_textual(entry.path):
+                continue
+
+            # Skip binary files and excluded extensions
+            # if not is_text_file(file_path) or any(fnmatch.fnmatch(filename, pat) for pat in exclude_extensions):
+            #     continue
 
-    # Walk through the directory
-    for root, dirs, files in os.walk(directory):
-        # Exclude directories
-        dirs[:] = [d for d in dirs if d not in exclude_dirs]
-        for filename in files:
-            # Replace text in the filename if needed
-            new_filename = replace_text_in_filename(filename, needle_variations, replacement_variations)
-            if new_filename != filename:
-                original_file_path = os.path.join(root, filename)
-                new_file_path = os.path.join(root, new_filename)
-                
-                # Rename the file
-                if (dry_run):
-                    print(f'Would rename "{original_file_path}" to "{new_file_path}"')
+            futures[executor.submit(replace_file, entry.path, *submit_args)] = entry.path
+
+        # Report from the main thread in walk order, so the output of each file stays together
+        # and the output of two runs can be compared
+        for future, file_path in futures.items():
+            # One unreadable file must not abort the run before the renames are applied
+            try:
+                matched = future.result()
+            except OSError as e:
+                print(f"Error replacing in file {file_path}: {e}")
+                continue
+
+            for variation in matched:
+                variation = variation.decode('utf-8')
+                if dry_run:
+                    print(f"Would replace {variation} with {mapping[variation]} in {file_path}")
                 else:
-                    try:
-                        os.rename(original_file_path, new_file_path)
-                        print(f'Renamed "{original_file_path}" to "{new_file_path}"')
-                    except OSError as e:
-                        print(f"Error renaming file {original_file_path}: {e}")
+                    print(f"Replaced {variation} with {mapping[variation]} in {file_path}")
+
+    # Rename last so that no replace inside a file works on a stale path
+    _apply_renames(plan, dry_run)
+
+def rename_files(directory: str, needle: str, replacement: str, exclude_dirs=None, dry_run: bool = False, ask: bool = True):
+    """
+    Rename files within the given directory and its subdirectories.
+    It looks for the needle in any naming convention in the filenames and replaces it with the
+    replacement in the same naming convention.
+
+    Parameters:
+    directory (str): The root directory from which to start renaming files.
+    needle (str): The substring to look for in filenames for renaming.
+    replacement (str): The substring that will replace the needle in filenames.
+    exclude_dirs (list): Directories to exclude from the search.
+    dry_run (bool): If True, print out the rename actions without performing them.
+    ask (bool): If True, ask for confirmation before performing the replace operation.
+    """
+    rename_and_replace(directory, needle, replacement, exclude_dirs=exclude_dirs, dry_run=dry_run, ask=ask, replace=False)
 
-def replace_in_files(directory: str, needle: str, replacement: str, exclude_dirs=None, exclude_extensions=None, dry_run: bool = True, ask: bool = True):
+def replace_in_files(directory: str, needle: str, replacement: str, exclude_dirs=None, exclude_extensions=None, dry_run: bool = True, ask: bool = True, max_workers: int = None, processes: bool = False):
     """
     Replace occurrences of needle in any format (camelCase, PascalCase, snake_case, kebab-case) within text files in a directory.
     Supports exclusions for directories, file extensions, and wildcard patterns.
@@ -290,83 +905,40 @@ def replace_in_files(directory: str, needle: str, replacement: str, exclude_dirs
     exclude_extensions (list): File extensions to exclude from the search.
     dry_run (bool): If True, print out the replace actions without performing them.
     ask (bool): If True, ask for confirmation before performing the replace operation.
+    max_workers (int): The number of threads or processes replacing inside files, defaults to min(32, 4 * CPU count)
+                       threads, or to one process per CPU.
+    processes (bool): If True, replace inside files in worker processes instead of threads, for CPU-bound workloads.
     """
-    
-    # Verify the directory exists and is not empty
-    if not os.listdir(directory):
-        raise ValueError(f"The directory '{directory}' is empty or does not exist.")
-
-    # Verify the needle is not falsy
-    if not needle:
-        raise ValueError("The needle must not be empty or only whitespace.")
-
-    # Check if the replacement is falsy and ask for confirmation
-    if not replacement and ask:
-        confirmation = input("The replacement string is empty. This will remove the needle from filenames. Are you sure you want to continue? (y/n): ")
-        if confirmation.lower() != 'y':
-            print("Operation cancelled.")
-            return
-                
-    # Ask for user confirmation
-    if ask:
-        if dry_run:
-            confirmation = input("The operation is in dry run mode. Do you want to proceed? (y/n): ")
-        else:
-            confirmation = input("Are you sure you want to replace inside files? This action cannot be undone. (y/n): ")
-
-        if confirmation.lower() != 'y':
-            print("Operation cancelled.")
-            return
-
-    # Generate all case variations for needle and replacement
-    needle_variations = generate_all_case_variations(needle)
-    replacement_variations = generate_all_case_variations(replacement)
-
-    exclude_dirs = exclude_dirs if exclude_dirs else []
-    exclude_extensions = exclude_extensions if exclude_extensions else []
-
-    # Print the operation details
-    abs_directory = os.path.abspath(directory)
-    print(f"Directory: {abs_directory}")
-    print(f"Needle: {needle}")
-    print(f"Replacement: {replacement}")
-    print(f"Exclude directory: {exclude_dirs}")
-    print(f"Exclude extensions: {exclude_extensions}")
-    
-    for root, dirs, files in os.walk(directory):
-        # Exclude directories
-        dirs[:] = [d for d in dirs if d not in exclude_dirs]
-        for filename in files:
-            
-            file_path = os.path.join(root, filename)
-                        
-            # Skip binary files and excluded extensions
-            if not is_text_file_by_ext(filename) or any(fnmatch.fnmatch(filename, pat) for pat in exclude_extensions):
-                continue
-
-            # Skip binary files and excluded extensions
-            # if not is_text_file(file_path) or any(fnmatch.fnmatch(filename, pat) for pat in exclude_extensions):
-            #     continue
-            
-            # Read and potentially replace content
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-
-            # Replace content if needle in any format is found
-            new_content = content
-            for case, variation in needle_variations.items():
-                if variation in content:                    
-                    new_content = new_content.replace(variation, replacement_variations[case])
-                    
-                    if dry_run:
-                        print(f"Would replace {variation} with {replacement_variations[case]} in {file_path}")
-                    else:
-                        print(f"Replaced {variation} with {replacement_variations[case]} in {file_path}")
-
-            # If changes were made, write them back to the file or print the action
-            if new_content != content and not dry_run:
-                    with open(file_path, 'w', encoding='utf-8') as file:
-                        file.write(new_content)
+    rename_and_replace(directory, needle, replacement, exclude_dirs=exclude_dirs, exclude_extensions=exclude_extensions, dry_run=dry_run, ask=ask, rename=False, max_workers=max_workers, processes=processes)
+
+# Extensions of files treated as text, lowercased
+_TEXT_FILE_EXTENSIONS = frozenset([
+    '.txt', '.md', '.py', '.js', '.java', '.c', '.cpp', '.cs', '.h', 
+    '.html', '.css', '.scss', '.less', '.json', '.xml', '.yaml', '.yml', 
+    '.csv', '.log', '.ini', '.conf', '.cfg', '.plist', '.php', '.sh', 
+    '.bat', '.cmd', '.ps1', '.vbs', '.rb', '.go', '.lua', '.pl', 
+    '.hs', '.lhs', '.scala', '.sbt', '.swift', '.sql', '.r', '.m', 
+    '.tex', '.cls', '.sty', '.bib', '.kt', '.groovy', '.gd', '.tcl', 
+    '.rst', '.rest', '.http', '.properties', '.toml', '.rs', '.dart', 
+    '.xhtml', '.jsp', '.jspx', '.asp', '.aspx', '.erb', '.twig', 
+    '.jl', '.ex', '.exs', '.eex', '.leex', '.svelte', '.vue', 
+    '.elm', '.cljs', '.clj', '.edn', '.coffee', '.litcoffee', '.iced', 
+    '.aj', '.asm', '.s', '.pas', '.p', '.pp', '.f', '.for', '.f90', '.f95', 
+    '.ml', '.mli', '.sml', '.thy', '.hs', '.lhs', '.pyw', '.rpy', 
+    '.rego', '.rs', '.d', '.rkt', '.sch', '.rktl', '.scm', '.ess', 
+    '.rhtml', '.erb', '.mustache', '.hbs', '.phtml', '.twig', '.ctp', 
+    '.module', '.inc', '.bash', '.ksh', '.csh', '.fish', '.awk', 
+    '.ps', '.nix', '.bb', '.bbappend', '.bbclass', '.recipe', 
+    '.lisp', '.lsp', '.l', '.ny', '.pod', '.pm', '.t', '.pl', 
+    '.php4', '.php5', '.phtml', '.ctp', '.twig', '.module', 
+    '.vb', '.bas', '.cls', '.ctl', '.dsr', '.frm', '.vba', 
+    '.applescript', '.osascript', '.ino', '.eps', '.pgn', '.sk', 
+    '.brs', '.brightscript', '.sublime-commands', '.sublime-completions', 
+    '.sublime-keymap', '.sublime-macro', '.sublime-menu', '.sublime-mousemap', 
+    '.sublime-project', '.sublime-settings', '.sublime-snippet', '.sublime-theme', 
+    '.sublime-workspace', '.sublime_metrics', '.sublime_session'
+    # Add more as needed
+])
 
 def is_text_file_by_ext(filename: str) -> bool:
     """
@@ -378,34 +950,34 @@ def is_text_file_by_ext(filename: str) -> bool:
     Returns:
     bool: True if the file is likely a text file, False otherwise.
     """
-    text_file_extensions = [
-        '.txt', '.md', '.py', '.js', '.java', '.c', '.cpp', '.cs', '.h', 
-        '.html', '.css', '.scss', '.less', '.json', '.xml', '.yaml', '.yml', 
-        '.csv', '.log', '.ini', '.conf', '.cfg', '.plist', '.php', '.sh', 
-        '.bat', '.cmd', '.ps1', '.vbs', '.rb', '.go', '.lua', '.pl', 
-        '.hs', '.lhs', '.scala', '.sbt', '.swift', '.sql', '.r', '.m', 
-        '.tex', '.cls', '.sty', '.bib', '.kt', '.groovy', '.gd', '.tcl', 
-        '.rst', '.rest', '.http', '.properties', '.toml', '.rs', '.dart', 
-        '.xhtml', '.jsp', '.jspx', '.asp', '.aspx', '.erb', '.twig', 
-        '.jl', '.ex', '.exs', '.eex', '.leex', '.svelte', '.vue', 
-        '.elm', '.cljs', '.clj', '.edn', '.coffee', '.litcoffee', '.iced', 
-        '.aj', '.asm', '.s', '.pas', '.p', '.pp', '.f', '.for', '.f90', '.f95', 
-        '.ml', '.mli', '.sml', '.thy', '.hs', '.lhs', '.pyw', '.rpy', 
-        '.rego', '.rs', '.d', '.rkt', '.sch', '.rktl', '.scm', '.ess', 
-        '.rhtml', '.erb', '.mustache', '.hbs', '.phtml', '.twig', '.ctp', 
-        '.module', '.inc', '.bash', '.ksh', '.csh', '.fish', '.awk', 
-        '.ps', '.nix', '.bb', '.bbappend', '.bbclass', '.recipe', 
-        '.lisp', '.lsp', '.l', '.ny', '.pod', '.pm', '.t', '.pl', 
-        '.php4', '.php5', '.phtml', '.ctp', '.twig', '.module', 
-        '.vb', '.bas', '.cls', '.ctl', '.dsr', '.frm', '.vba', 
-        '.applescript', '.osascript', '.ino', '.eps', '.pgn', '.sk', 
-        '.brs', '.brightscript', '.sublime-commands', '.sublime-completions', 
-        '.sublime-keymap', '.sublime-macro', '.sublime-menu', '.sublime-mousemap', 
-        '.sublime-project', '.sublime-settings', '.sublime-snippet', '.sublime-theme', 
-        '.sublime-workspace', '.sublime_metrics', '.sublime_session'
-        # Add more as needed
-    ]
-    return any(filename.lower().endswith(ext) for ext in text_file_extensions)
+    # Every known extension has a single leading dot, so the last dot of the filename is enough
+    dot = filename.rfind('.')
+    return dot != -1 and filename[dot:].lower() in _TEXT_FILE_EXTENSIONS
+
+def _looks_textual(filepath: str) -> bool:
+    """
+    Check if a file looks like a UTF-8 text file by sniffing its first bytes.
+
+    Parameters:
+    filepath (str): The full path to the file to check.
+
+    Returns:
+    bool: True if the header has no NUL byte and decodes as UTF-8, False otherwise.
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            chunk = file.read(_SNIFF_SIZE)
+    except OSError:
+        return False
+
+    if b'\0' in chunk:
+        return False
+    try:
+        chunk.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the end of the chunk is still valid text
+        return len(chunk) == _SNIFF_SIZE and e.reason == 'unexpected end of data'
+    return True
 
 def is_text_file(filepath: str) -> bool:
     """
@@ -438,6 +1010,8 @@ def main():
     parser.add_argument('-y','--yes', action='store_true', help='Do not ask for confirmation before performing rename and replace operation.')
     parser.add_argument('--exclude-dirs', nargs='*', help='A list of directories to exclude from renaming.')
     parser.add_argument('--exclude-extensions', nargs='*', help='A list of file extensions to exclude from renaming.')
+    parser.add_argument('-j', '--jobs', type=int, help='The number of threads or processes replacing inside files, defaults to min(32, 4 * CPU count) threads or one process per CPU.')
+    parser.add_argument('--processes', action='store_true', help='Replace inside files in worker processes instead of threads, for CPU-bound workloads.')
     
     
     # Parse the arguments
@@ -451,8 +1025,9 @@ def main():
             parser.error("If not using --needle/-n and --replacement/-r, both needle and replacement must be provided as positional arguments.")
 
     # Check if the directory is provided and valid
-    if not args.directory or not os.path.exists(args.directory) or not os.listdir(args.directory):
+    if not args.directory:
         raise ValueError(f"The directory is required and must not be empty or non-existent.")
+    _ensure_nonempty(args.directory)
 
     # Check if needle is provided and valid
     if not args.needle:
@@ -467,26 +1042,20 @@ def main():
     else:
         args.replacement = args.replacement  # Ensure replacement is not None
 
-    # Call the rename_files function
+    # Rename files, and replace inside files if requested, in a single walk
     try:
-        rename_files(
+        rename_and_replace(
             args.directory,
             args.needle,
             args.replacement,
             exclude_dirs=args.exclude_dirs,
+            exclude_extensions=args.exclude_extensions,
             dry_run=args.dry_run,
-            ask=not args.yes
+            ask=not args.yes,
+            replace=args.files,
+            max_workers=args.jobs,
+            processes=args.processes
         )
-        if args.files:
-            replace_in_files(
-                args.directory,
-                args.needle,
-                args.replacement,
-                exclude_dirs=args.exclude_dirs,
-                exclude_extensions=args.exclude_extensions,
-                dry_run=args.dry_run,
-                 ask=not args.yes
-            )
     except ValueError as e:
         print(e)
         exit(1)
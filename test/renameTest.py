@@ -2,103 +2,123 @@ import unittest
 
 import sys
 import os
+import io
+import re
 import tempfile
-from shutil import copytree, rmtree
 
 # Add the parent directory to sys.path to import the module located there
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from rename import to_pascal_case, to_camel_case, to_snake_case, to_kebab_case, detect_case_type, convert_string, generate_all_case_variations,replace_text_in_filename, rename_files, replace_in_files
+from rename import to_pascal_case, to_camel_case, to_snake_case, to_kebab_case, detect_case_type, convert_string, generate_all_case_variations,replace_text_in_filename, build_replacement_pairs, rename_files, replace_in_files, rename_and_replace, is_text_file_by_ext, clear_caches, _replace_in_chunks, _replace_with_pattern, _build_automaton, _replace_with_automaton, ahocorasick
 
-class TestNamingConversions(unittest.TestCase):
+class TestPureFunctions(unittest.TestCase):
 
-    def setUp(self):
-        # Set up the case variations for the needle and the replacement
-        self.needle = 'example'
-        self.replacement = 'sample'
-        self.needle_variations = generate_all_case_variations(self.needle)
-        self.replacement_variations = generate_all_case_variations(self.replacement)
-        
-        # Set up a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
+    @classmethod
+    def setUpClass(cls):
+        # Set up the case variations for the needle and the replacement once for the class
+        cls.needle = 'example'
+        cls.replacement = 'sample'
+        cls.needle_variations = generate_all_case_variations(cls.needle)
+        cls.replacement_variations = generate_all_case_variations(cls.replacement)
 
-        # Create subdirectories and files for testing
-        os.makedirs(os.path.join(self.temp_dir, 'rename_file_test_dir'), exist_ok=True)
-        with open(os.path.join(self.temp_dir, 'example_test_file.txt'), 'w') as f:
-            f.write('This is a test file.')
-        with open(os.path.join(self.temp_dir, 'rename_file_test_dir', 'example_test_file2.txt'), 'w') as f:
-            f.write('This is another test file.')
-                        
     def tearDown(self):
-        # Remove the temporary directory after the test
-        rmtree(self.temp_dir)
-        
+        # Keep the conversion caches from leaking between tests
+        clear_caches()
+
+    # Test cases as (input, expected) pairs, built once when the module is imported
+    _PASCAL_CASES = (
+        ('this-is-kebab-case', 'ThisIsKebabCase'),
+        ('this-is-1-keb1ab-case-string', 'ThisIs1Keb1abCaseString'),
+    )
+
+    _CAMEL_CASES = (
+        ('this-is-kebab-case', 'thisIsKebabCase'),
+        ('this-is-1-keb1ab-case-string', 'thisIs1Keb1abCaseString'),
+    )
+
+    _SNAKE_CASES = (
+        ('this-is-kebab-case', 'this_is_kebab_case'),
+        ('this-is-1-keb1ab-case-string', 'this_is_1_keb1ab_case_string'),
+        ('ThisIsPascalCase', 'this_is_pascal_case'),
+        ('XMLHttpRequest', 'xml_http_request'),
+        ('a--b', 'a_b'),
+    )
+
+    _KEBAB_CASES = (
+        ('ThisIsCamelCase', 'this-is-camel-case'),
+        ('ThisIsPascalCase', 'this-is-pascal-case'),
+        ('this_is_snake_case', 'this-is-snake-case'),
+        ('this-is-already-kebab-case', 'this-is-already-kebab-case'),
+        ('This-Is_Already_Mixed', 'this-is-already-mixed'),
+        ('This--Is_Already_Mixed', 'this-is-already-mixed'),
+        ('This-1-Is_Alre1ady_Mixed', 'this-1-is-alre1ady-mixed'),
+        ('XMLHttpRequest', 'xml-http-request'),
+        ('isJSON', 'is-json'),
+    )
+
+    _DETECT_CASES = (
+        ('camelCaseString', 'camelCase'),
+        ('came1l1CaseString', 'camelCase'),
+        ('thisIsAlreadyCamelCase', 'camelCase'),
+        ('isJSON', 'camelCase'),
+        ('PascalCaseString', 'PascalCase'),
+        ('Pasca1lCa1seString', 'PascalCase'),
+        ('NoConvention123', 'PascalCase'),
+        ('XMLHttpRequest', 'PascalCase'),
+        ('snake_case_string', 'snake_case'),
+        ('snak1e1_1case_string', 'snake_case'),
+        ('kebab-case-string', 'kebab-case'),
+        ('keba1b1-1case-string', 'kebab-case'),
+        ('Not-A_Convention', 'other'),
+    )
+
+    _DETECT_NOT_STRICT_CASES = (
+        ('Not-A_Convention', 'kebab-case'),
+        ('not_A_convention', 'snake_case'),
+        ('XMLHttpRequest', 'PascalCase'),
+        ('isJSON', 'camelCase'),
+    )
+
+    # Each input is converted to every target case
+    _CONVERT_CASES = (
+        ('this-is-kebab-case', {'camelCase': 'thisIsKebabCase', 'PascalCase': 'ThisIsKebabCase', 'snake_case': 'this_is_kebab_case', 'kebab-case': 'this-is-kebab-case'}),
+        ('this_is_snake_case', {'camelCase': 'thisIsSnakeCase', 'PascalCase': 'ThisIsSnakeCase', 'snake_case': 'this_is_snake_case', 'kebab-case': 'this-is-snake-case'}),
+        ('ThisIsPascalCase', {'camelCase': 'thisIsPascalCase', 'PascalCase': 'ThisIsPascalCase', 'snake_case': 'this_is_pascal_case', 'kebab-case': 'this-is-pascal-case'}),
+        ('thisIsCamelCase', {'camelCase': 'thisIsCamelCase', 'PascalCase': 'ThisIsCamelCase', 'snake_case': 'this_is_camel_case', 'kebab-case': 'this-is-camel-case'}),
+    )
+
+    def assertCases(self, function, cases, **kwargs):
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(function(text, **kwargs), expected)
+
     # Test cases for to_pascal_case function
     def test_to_pascal_case(self):
-        self.assertEqual(to_pascal_case('this-is-kebab-case'), 'ThisIsKebabCase')
-        self.assertEqual(to_pascal_case('this-is-1-keb1ab-case-string'), 'ThisIs1Keb1abCaseString')
-  
+        self.assertCases(to_pascal_case, self._PASCAL_CASES)
+
     # Test cases for to_camel_case function
     def test_to_camel_case(self):
-        self.assertEqual(to_camel_case('this-is-kebab-case'), 'thisIsKebabCase')
-        self.assertEqual(to_camel_case('this-is-1-keb1ab-case-string'), 'thisIs1Keb1abCaseString')
-     
+        self.assertCases(to_camel_case, self._CAMEL_CASES)
+
     # Test cases for to_snake_case function
     def test_to_snake_case(self):
-        self.assertEqual(to_snake_case('this-is-kebab-case'), 'this_is_kebab_case')
-        self.assertEqual(to_snake_case('this-is-1-keb1ab-case-string'), 'this_is_1_keb1ab_case_string')
+        self.assertCases(to_snake_case, self._SNAKE_CASES)
 
     # Test cases for to_kebab_case function
     def test_to_kebab_case(self):
-        self.assertEqual(to_kebab_case('ThisIsCamelCase'), 'this-is-camel-case')
-        self.assertEqual(to_kebab_case('ThisIsPascalCase'), 'this-is-pascal-case')
-        self.assertEqual(to_kebab_case('this_is_snake_case'), 'this-is-snake-case')
-        self.assertEqual(to_kebab_case('this-is-already-kebab-case'), 'this-is-already-kebab-case')
-        self.assertEqual(to_kebab_case('This-Is_Already_Mixed'), 'this-is-already-mixed')
-        self.assertEqual(to_kebab_case('This--Is_Already_Mixed'), 'this-is-already-mixed')
-        self.assertEqual(to_kebab_case('This-1-Is_Alre1ady_Mixed'), 'this-1-is-alre1ady-mixed')
-        
+        self.assertCases(to_kebab_case, self._KEBAB_CASES)
+
     # Test cases for detect_case_type function
     def test_detect_case_type(self):
-        
-        self.assertEqual(detect_case_type('camelCaseString'), 'camelCase')
-        self.assertEqual(detect_case_type('came1l1CaseString'), 'camelCase')
-        self.assertEqual(detect_case_type('thisIsAlreadyCamelCase'), 'camelCase')
-        self.assertEqual(detect_case_type('isJSON'), 'camelCase')
-                
-        self.assertEqual(detect_case_type('PascalCaseString'), 'PascalCase')
-        self.assertEqual(detect_case_type('Pasca1lCa1seString'), 'PascalCase')
-        self.assertEqual(detect_case_type('NoConvention123'), 'PascalCase')
-        self.assertEqual(detect_case_type('XMLHttpRequest'), 'PascalCase')
-        
-        self.assertEqual(detect_case_type('snake_case_string'), 'snake_case')
-        self.assertEqual(detect_case_type('snak1e1_1case_string'), 'snake_case')
-                
-        self.assertEqual(detect_case_type('kebab-case-string'), 'kebab-case')
-        self.assertEqual(detect_case_type('keba1b1-1case-string'), 'kebab-case')
-
-    def test_convert_to_camel_case(self):
-        self.assertEqual(convert_string('this-is-kebab-case', 'camelCase'), 'thisIsKebabCase')
-        self.assertEqual(convert_string('this_is_snake_case', 'camelCase'), 'thisIsSnakeCase')
-        self.assertEqual(convert_string('ThisIsPascalCase', 'camelCase'), 'thisIsPascalCase')
-        self.assertEqual(convert_string('thisIsCamelCase', 'camelCase'), 'thisIsCamelCase')
-
-    def test_convert_to_pascal_case(self):
-        self.assertEqual(convert_string('this-is-kebab-case', 'PascalCase'), 'ThisIsKebabCase')
-        self.assertEqual(convert_string('this_is_snake_case', 'PascalCase'), 'ThisIsSnakeCase')
-        self.assertEqual(convert_string('ThisIsPascalCase', 'PascalCase'), 'ThisIsPascalCase')
-        self.assertEqual(convert_string('thisIsCamelCase', 'PascalCase'), 'ThisIsCamelCase')
-
-    def test_convert_to_snake_case(self):
-        self.assertEqual(convert_string('this-is-kebab-case', 'snake_case'), 'this_is_kebab_case')
-        self.assertEqual(convert_string('this_is_snake_case', 'snake_case'), 'this_is_snake_case')
-        self.assertEqual(convert_string('ThisIsPascalCase', 'snake_case'), 'this_is_pascal_case')
-        self.assertEqual(convert_string('thisIsCamelCase', 'snake_case'), 'this_is_camel_case')
-
-    def test_convert_to_kebab_case(self):
-        self.assertEqual(convert_string('this-is-kebab-case', 'kebab-case'), 'this-is-kebab-case')
-        self.assertEqual(convert_string('this_is_snake_case', 'kebab-case'), 'this-is-snake-case')
-        self.assertEqual(convert_string('ThisIsPascalCase', 'kebab-case'), 'this-is-pascal-case')
-        self.assertEqual(convert_string('thisIsCamelCase', 'kebab-case'), 'this-is-camel-case')
+        self.assertCases(detect_case_type, self._DETECT_CASES)
+
+    def test_detect_case_type_not_strict(self):
+        self.assertCases(detect_case_type, self._DETECT_NOT_STRICT_CASES, strict=False)
+
+    def test_convert_string(self):
+        for text, expected in self._CONVERT_CASES:
+            for to_case, converted in expected.items():
+                with self.subTest(text=text, to_case=to_case):
+                    self.assertEqual(convert_string(text, to_case), converted)
 
     def test_no_conversion(self):
         self.assertEqual(convert_string('AlreadyOtherFormat123', 'other'), 'AlreadyOtherFormat123')
@@ -106,7 +126,7 @@ class TestNamingConversions(unittest.TestCase):
     def test_unsupported_case(self):
         with self.assertRaises(ValueError):
             convert_string('someString', 'unsupportedCase')
-        
+
     def test_convert_naming_conventions(self):
         self.assertEqual(generate_all_case_variations('this-is-kebab-case'), 
         {
@@ -116,8 +136,6 @@ class TestNamingConversions(unittest.TestCase):
             'snake_case':  'this_is_kebab_case',
             'kebab-case': 'this-is-kebab-case'
         })
-            
-
 
     def test_replace_kebab_case(self):
         filename = 'this-is-an-example-file.txt'
@@ -160,7 +178,95 @@ class TestNamingConversions(unittest.TestCase):
         expected = 'sample-sample-file.txt'
         result = replace_text_in_filename(filename, self.needle_variations, self.replacement_variations)
         self.assertEqual(result, expected)
-        
+
+    def test_replace_mixed_cases(self):
+        filename = 'example_file-ExampleFile.txt'
+        expected = 'sample_file-SampleFile.txt'
+        result = replace_text_in_filename(filename, self.needle_variations, self.replacement_variations)
+        self.assertEqual(result, expected)
+
+    def test_build_replacement_pairs(self):
+        pairs = build_replacement_pairs(generate_all_case_variations('testString'), generate_all_case_variations('demoExample'))
+        self.assertEqual(pairs[0], ('test-string', 'demo-example'))
+        self.assertEqual([len(n) for n, _ in pairs], sorted((len(n) for n, _ in pairs), reverse=True))
+
+    def test_is_text_file_by_ext(self):
+        self.assertTrue(is_text_file_by_ext('README.MD'))
+        self.assertTrue(is_text_file_by_ext('archive.tar.py'))
+        self.assertTrue(is_text_file_by_ext('project.sublime-project'))
+        self.assertTrue(is_text_file_by_ext('.txt'))
+        self.assertFalse(is_text_file_by_ext('image.png'))
+        self.assertFalse(is_text_file_by_ext('Makefile'))
+
+    def test_build_replacement_pairs_deduplicates(self):
+        # Every variation of 'user' but PascalCase is identical, the original one is kept
+        pairs = build_replacement_pairs(generate_all_case_variations('user'), generate_all_case_variations('fooBar'))
+        self.assertEqual(pairs, [('user', 'fooBar'), ('User', 'FooBar')])
+
+    def assertAutomatonMatchesPattern(self, build_automaton):
+        # The automaton must give the same result as the alternation pattern: leftmost match, longest needle first
+        mappings = (
+            {b'ab': b'X', b'abc': b'Y', b'bc': b'Z', b'b': b'W'},
+            # A shorter needle ending first must not hide a longer one starting earlier
+            {b'a': b'[a]', b'bbab': b'X', b'abab': b'Y', b'babb': b'Z'},
+            {variation.encode('utf-8'): value.encode('utf-8') for variation, value in build_replacement_pairs(generate_all_case_variations('fooBar'), generate_all_case_variations('baz'))},
+            {variation.encode('utf-8'): value.encode('utf-8') for variation, value in build_replacement_pairs(generate_all_case_variations('_B_-'), generate_all_case_variations('x'))},
+        )
+        contents = (b'', b'abcabc', b'ababc', b'bcab', b'abbc', b'bbb', b'ba', b'bbabab', b'fooBarFooBar foo-bar_foo_barfoo_bar-', b'_B', b'_B_', b'B_B', b'-_B_-b-', b'no match')
+        for mapping in mappings:
+            pattern = re.compile(b'|'.join(re.escape(needle) for needle in sorted(mapping, key=len, reverse=True)))
+            automaton = build_automaton(mapping)
+            for content in contents:
+                with self.subTest(mapping=mapping, content=content):
+                    new_content, matched = _replace_with_automaton(content, automaton, mapping)
+                    self.assertEqual((bytes(new_content), matched), _replace_with_pattern(content, pattern, mapping))
+
+    @unittest.skipUnless(ahocorasick, 'pyahocorasick is not installed')
+    def test_replace_with_automaton(self):
+        self.assertAutomatonMatchesPattern(_build_automaton)
+
+    def test_replace_with_automaton_match_resolution(self):
+        # Report every match by end position like Automaton.iter, so the match resolution runs without pyahocorasick
+        class AllMatches:
+            def __init__(self, mapping):
+                self.needles = [needle.decode('latin-1') for needle in mapping]
+
+            def iter(self, text):
+                for end in range(len(text)):
+                    for needle in sorted(self.needles, key=len, reverse=True):
+                        if text.endswith(needle, 0, end + 1):
+                            yield end, needle.encode('latin-1')
+
+        self.assertAutomatonMatchesPattern(AllMatches)
+
+    def test_replace_in_chunks(self):
+        # Matches spanning two chunks are replaced as in a single pass
+        mapping = {b'example': b'sample', b'example_value': b'sample_value'}
+        pattern = re.compile(b'example_value|example')
+        content = (b'x' * 65530) + b'example_value example'
+        matched = {}
+
+        result = b''.join(_replace_in_chunks(io.BytesIO(content), pattern, mapping, matched))
+
+        self.assertEqual(result, (b'x' * 65530) + b'sample_value sample')
+        self.assertEqual(matched, {b'example_value': 1, b'example': 1})
+
+
+class TestFilesystemOps(unittest.TestCase):
+
+    def setUp(self):
+        # Set up a temporary directory, removed automatically after the test
+        self.temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+        # Keep the conversion caches from leaking between tests
+        self.addCleanup(clear_caches)
+
+        # Create subdirectories and files for testing
+        os.makedirs(os.path.join(self.temp_dir, 'rename_file_test_dir'), exist_ok=True)
+        with open(os.path.join(self.temp_dir, 'example_test_file.txt'), 'w') as f:
+            f.write('This is a test file.')
+        with open(os.path.join(self.temp_dir, 'rename_file_test_dir', 'example_test_file2.txt'), 'w') as f:
+            f.write('This is another test file.')
+
     def test_replace_in_files(self):
         # Test cases in the format: {filename: (original_content, expected_content)}
         test_cases = {
@@ -204,7 +310,95 @@ class TestNamingConversions(unittest.TestCase):
             with open(os.path.join(self.temp_dir, 'replace_file_test_dir', filename), 'r') as f:
                 content = f.read()
                 self.assertEqual(content, expected_content)
-       
+
+    def test_replace_in_large_file(self):
+        # Files above 1 MiB are streamed instead of read in memory
+        filler = 'x' * (1 << 20)
+        file_path = os.path.join(self.temp_dir, 'large.txt')
+        with open(file_path, 'w') as f:
+            f.write('example_value\n' + filler + '\nExampleValue')
+
+        replace_in_files(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        with open(file_path, 'r') as f:
+            self.assertEqual(f.read(), 'sample_value\n' + filler + '\nSampleValue')
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'symlinks are not supported')
+    def test_replace_in_large_file_through_symlink(self):
+        # The target lives outside the walked directory so that it is reached only through the link
+        target_dir = self.enterContext(tempfile.TemporaryDirectory())
+        target = os.path.join(target_dir, 'big.txt')
+        filler = 'x' * (1 << 20)
+        with open(target, 'w') as f:
+            f.write('example_value\n' + filler)
+        link = os.path.join(self.temp_dir, 'link.txt')
+        os.symlink(target, link)
+
+        replace_in_files(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        # The link is kept and the replacement is written to its target
+        self.assertTrue(os.path.islink(link))
+        with open(target, 'r') as f:
+            self.assertEqual(f.read(), 'sample_value\n' + filler)
+
+    def test_replace_in_files_unknown_extension(self):
+        # Files with an unknown extension are replaced only if they look like text
+        with open(os.path.join(self.temp_dir, 'Makefile'), 'w') as f:
+            f.write('build: example')
+        with open(os.path.join(self.temp_dir, 'example.bin'), 'wb') as f:
+            f.write(b'example\0')
+
+        replace_in_files(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        with open(os.path.join(self.temp_dir, 'Makefile'), 'r') as f:
+            self.assertEqual(f.read(), 'build: sample')
+        with open(os.path.join(self.temp_dir, 'example.bin'), 'rb') as f:
+            self.assertEqual(f.read(), b'example\0')
+
+    def test_replace_in_files_skips_vcs_dirs(self):
+        # Version control metadata has no known extension but looks like text, it must never be edited
+        os.makedirs(os.path.join(self.temp_dir, '.git'))
+        with open(os.path.join(self.temp_dir, '.git', 'HEAD'), 'w') as f:
+            f.write('ref: refs/heads/example')
+
+        replace_in_files(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        with open(os.path.join(self.temp_dir, '.git', 'HEAD'), 'r') as f:
+            self.assertEqual(f.read(), 'ref: refs/heads/example')
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), 'FIFOs are not supported')
+    def test_replace_in_files_skips_fifo(self):
+        # Opening a FIFO to sniff it would block forever, only regular files are read
+        os.mkfifo(os.path.join(self.temp_dir, 'example_pipe'))
+        with open(os.path.join(self.temp_dir, 'a.txt'), 'w') as f:
+            f.write('example')
+
+        replace_in_files(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        with open(os.path.join(self.temp_dir, 'a.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'sample')
+
+    def test_replace_in_files_exclude_extensions(self):
+        for filename in ('kept.txt', 'skipped.md', 'skipped.min.js'):
+            with open(os.path.join(self.temp_dir, filename), 'w') as f:
+                f.write('example')
+
+        replace_in_files(self.temp_dir, 'example', 'sample', exclude_extensions=['*.md', '*.min.js'], dry_run=False, ask=False)
+
+        expected = {'kept.txt': 'sample', 'skipped.md': 'example', 'skipped.min.js': 'example'}
+        for filename, expected_content in expected.items():
+            with open(os.path.join(self.temp_dir, filename), 'r') as f:
+                self.assertEqual(f.read(), expected_content)
+
+    def test_replace_in_files_processes(self):
+        with open(os.path.join(self.temp_dir, 'example_test_file.txt'), 'w') as f:
+            f.write('example-value')
+
+        replace_in_files(self.temp_dir, 'example', 'sample', dry_run=False, ask=False, max_workers=2, processes=True)
+
+        with open(os.path.join(self.temp_dir, 'example_test_file.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'sample-value')
+
     def test_rename_files(self):
         # Define the needle and the replacement
         needle = 'example'
@@ -220,7 +414,59 @@ class TestNamingConversions(unittest.TestCase):
         # Optionally, you can check the contents of the file to ensure it hasn't been altered
         with open(os.path.join(self.temp_dir, 'sample_test_file.txt'), 'r') as f:
             content = f.read()
-            self.assertIn('This is a test file.', content)                       
+            self.assertIn('This is a test file.', content)
+
+    def test_rename_files_existing_destination(self):
+        with open(os.path.join(self.temp_dir, 'sample_test_file.txt'), 'w') as f:
+            f.write('Existing file.')
+
+        rename_files(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        # The existing destination is not overwritten and the source keeps its name
+        with open(os.path.join(self.temp_dir, 'sample_test_file.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'Existing file.')
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'example_test_file.txt')))
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'rename_file_test_dir', 'sample_test_file2.txt')))
+
+    def test_empty_or_missing_directory(self):
+        empty_dir = os.path.join(self.temp_dir, 'empty_dir')
+        os.makedirs(empty_dir)
+        with self.assertRaises(ValueError):
+            rename_files(empty_dir, 'example', 'sample', ask=False)
+        with self.assertRaises(ValueError):
+            replace_in_files(os.path.join(self.temp_dir, 'missing_dir'), 'example', 'sample', ask=False)
+
+    def test_rename_and_replace(self):
+        with open(os.path.join(self.temp_dir, 'example_test_file.txt'), 'w') as f:
+            f.write('exampleValue')
+
+        rename_and_replace(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        # The renamed file has its content replaced too
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'example_test_file.txt')))
+        with open(os.path.join(self.temp_dir, 'sample_test_file.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'sampleValue')
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'rename_file_test_dir', 'sample_test_file2.txt')))
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'symlinks are not supported')
+    def test_rename_and_replace_dangling_symlink(self):
+        link = os.path.join(self.temp_dir, 'example_link.txt')
+        os.symlink(os.path.join(self.temp_dir, 'missing.txt'), link)
+
+        rename_and_replace(self.temp_dir, 'example', 'sample', dry_run=False, ask=False)
+
+        # The dangling link is renamed like any file, and its missing content does not stop the other renames
+        self.assertFalse(os.path.lexists(link))
+        self.assertTrue(os.path.islink(os.path.join(self.temp_dir, 'sample_link.txt')))
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'sample_test_file.txt')))
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'rename_file_test_dir', 'sample_test_file2.txt')))
+
+    def test_rename_files_exclude_dirs(self):
+        rename_files(self.temp_dir, 'example', 'sample', exclude_dirs=['rename_file_test_dir'], dry_run=False, ask=False)
+
+        # Files in excluded directories must not be renamed
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'sample_test_file.txt')))
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'rename_file_test_dir', 'example_test_file2.txt')))
 
 if __name__ == '__main__':
     unittest.main()